@@ -1,106 +1,235 @@
-n#!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 Clean up duplicates and inconsistent states in geocoded results
 """
 
+import argparse
+import glob
 import json
+import marshal
+import mmap
+import os
+import platform
+import shutil
+import struct
 import sys
 import time
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-def load_stations(filename: str) -> List[Dict]:
-    """Load stations from JSON file"""
+try:
+    import ijson  # Optional: streams the input instead of loading it whole
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+# Placeholder prefix written into place_name for stations awaiting re-geocoding
+REGEOCODING_PREFIX = 'NEEDS_REGEOCODING:'
+
+# Number of timestamped backups kept next to a cleaned file (the validator keeps as many)
+MAX_BACKUPS = 5
+
+def _cache_key(filename: str) -> bytes:
+    """Identify the current version of a file by its mtime and size"""
+    stat = os.stat(filename)
+    return struct.pack('<qq', stat.st_mtime_ns, stat.st_size)
+
+def load_cache(filename: str) -> Optional[List[Dict]]:
+    """Load stations from the sidecar cache if it matches the JSON file"""
+    cache_name = f"{filename}.cache"
     try:
+        with open(cache_name, 'rb') as f:
+            stale = f.read(16) != _cache_key(filename)
+            # marshal only rebuilds plain data, so a planted cache file can't run code
+            stations = None if stale else marshal.load(f)
+        if stale:
+            os.remove(cache_name)  # Outdated full copy of the data; don't leave it lying around
+        return stations if isinstance(stations, list) else None
+    except Exception:
+        return None
+
+def save_cache(filename: str, stations: List[Dict]) -> None:
+    """Write the sidecar cache for the current version of the JSON file"""
+    cache_name = f"{filename}.cache"
+    try:
+        with open(f"{cache_name}.tmp", 'wb') as f:
+            f.write(_cache_key(filename))
+            marshal.dump(stations, f)
+        os.replace(f"{cache_name}.tmp", cache_name)
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Failed to write cache {cache_name}: {e}")
+
+def _load_with_orjson(filename: str) -> List[Dict]:
+    """Parse the raw file bytes with orjson, mapping the file instead of reading it"""
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(f.read())  # mmap can't map an empty file; let orjson report it
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+def load_stations(filename: str) -> Iterator[Dict]:
+    """Stream stations from JSON file one at a time"""
+    cached = load_cache(filename)
+    if cached is not None:
+        yield from cached
+    elif ijson is not None:
+        with open(filename, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    elif orjson is not None:
+        yield from _load_with_orjson(filename)
+    else:
         with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"ERROR: Failed to load {filename}: {e}")
-        return []
+            yield from json.load(f)
+
+def _encode_station(station: Dict) -> bytes:
+    """Encode one station as an indented array element"""
+    if orjson is not None:
+        encoded = orjson.dumps(station, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(station, ensure_ascii=False, indent=2).encode('utf-8')
+    # JSON strings never contain raw newlines, so this only shifts the layout
+    return b'  ' + encoded.replace(b'\n', b'\n  ')
+
+def write_stations(f, stations: Iterable[Dict]) -> None:
+    """Write stations as a JSON array one record at a time"""
+    separator = b'[\n'
+    for station in stations:
+        f.write(separator)
+        f.write(_encode_station(station))
+        separator = b',\n'
+    f.write(b'[]' if separator == b'[\n' else b'\n]')
+
+def remove_old_backups(filename: str, keep: int = MAX_BACKUPS) -> None:
+    """Delete all but the newest `keep` timestamped backups of a file"""
+    # Only files named <file>.backup.<unix time> are considered; the validator
+    # writes its backups under the same name and rotates them the same way
+    backups = sorted(
+        (int(path.rsplit('.', 1)[-1]), path)
+        for path in glob.glob(f"{glob.escape(filename)}.backup.*")
+        if path.rsplit('.', 1)[-1].isdigit()
+    )
+    for _, old_backup in backups[:-keep] if keep > 0 else backups:
+        try:
+            os.remove(old_backup)
+        except OSError as e:
+            print(f"WARNING: Could not remove old backup {old_backup}: {e}")
 
 def save_stations(filename: str, stations: List[Dict]) -> bool:
     """Save stations to JSON file with backup"""
     try:
-        # Create backup
+        # Create backup (a hardlink to the old file, copied only if linking fails)
         backup_name = f"{filename}.backup.{int(time.time())}"
-        import shutil
-        shutil.copy2(filename, backup_name)
+        try:
+            os.link(filename, backup_name)
+        except OSError:
+            shutil.copy2(filename, backup_name)
         print(f"Created backup: {backup_name}")
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(stations, f, ensure_ascii=False, indent=2)
+        # Write to a temporary file and swap it in so a crash never leaves a partial file
+        tmp_name = f"{filename}.tmp"
+        with open(tmp_name, 'wb') as f:
+            write_stations(f, stations)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, filename)
+        remove_old_backups(filename)
+        save_cache(filename, stations)
         return True
     except Exception as e:
         print(f"ERROR: Failed to save {filename}: {e}")
         return False
 
-def remove_duplicates(stations: List[Dict]) -> List[Dict]:
-    """Remove duplicate stations based on UUID, keeping the most recent"""
+def remove_duplicates(stations: Iterable[Dict], verbose: bool = False) -> Tuple[List[Dict], bool]:
+    """
+    Remove duplicate stations based on UUID, keeping the most recent
+    Returns: (stations, changed) where changed is False if nothing was dropped
+    """
     print("Removing duplicates...")
     
-    uuid_to_station = {}
-    duplicates_found = 0
+    best: Dict[str, Tuple[float, Dict]] = {}
+    kept_newer = []
+    kept_older = []
+    total = 0
     
     for station in stations:
+        total += 1
         uuid = station.get('uuid')
         if not uuid:
             continue
-            
-        if uuid in uuid_to_station:
-            duplicates_found += 1
-            existing = uuid_to_station[uuid]
-            current_timestamp = station.get('timestamp', 0)
-            existing_timestamp = existing.get('timestamp', 0)
-            
-            # Keep the one with the more recent timestamp
-            if current_timestamp > existing_timestamp:
-                uuid_to_station[uuid] = station
-                print(f"  Kept newer version of: {station.get('name', 'Unknown')}")
-            else:
-                print(f"  Kept older version of: {existing.get('name', 'Unknown')}")
+        
+        timestamp = station.get('timestamp') or 0
+        previous = best.get(uuid)
+        if previous is None:
+            best[uuid] = (timestamp, station)
+        # Keep the one with the more recent timestamp
+        elif timestamp > previous[0]:
+            best[uuid] = (timestamp, station)
+            kept_newer.append(station.get('name', 'Unknown'))
         else:
-            uuid_to_station[uuid] = station
+            kept_older.append(previous[1].get('name', 'Unknown'))
     
+    duplicates_found = len(kept_newer) + len(kept_older)
+    print(f"Loaded {total} stations")
     if duplicates_found > 0:
-        print(f"Found and resolved {duplicates_found} duplicates")
+        print(f"Found and resolved {duplicates_found} duplicates "
+              f"(kept newer: {len(kept_newer)}, kept older: {len(kept_older)})")
+        if verbose:
+            print("\n".join([f"  Kept newer version of: {name}" for name in kept_newer] +
+                            [f"  Kept older version of: {name}" for name in kept_older]))
     else:
         print("No duplicates found")
     
-    return list(uuid_to_station.values())
+    # Stations without a UUID are dropped too, so compare against the input count
+    return [station for _, station in best.values()], len(best) != total
 
-def fix_inconsistent_states(stations: List[Dict]) -> List[Dict]:
-    """Fix stations with inconsistent coordinates/place names"""
+def fix_inconsistent_states(stations: List[Dict], verbose: bool = False) -> Tuple[List[Dict], bool]:
+    """
+    Fix stations with inconsistent coordinates/place names (modifies stations in place)
+    Returns: (stations, changed) where changed is False if no station was fixed
+    """
     print("Fixing inconsistent states...")
     
-    fixed_count = 0
+    fixed_names = []
     
     for station in stations:
-        needs_regeocoding = station.get('needs_regeocoding', False)
-        extracted_location = station.get('extracted_location', '')
-        place_name = station.get('place_name', '')
+        # Most stations are not marked for regeocoding, so test that first
+        if not station.get('needs_regeocoding', False):
+            continue
         
         # If marked for regeocoding but still has old coordinates, clear them
-        if needs_regeocoding and place_name and not place_name.startswith('NEEDS_REGEOCODING:'):
-            print(f"  Fixing inconsistent state: {station.get('name', 'Unknown')}")
+        place_name = station.get('place_name', '')
+        # A first-letter check rules out most real place names before the full prefix test
+        if place_name and (place_name[0] != 'N' or not place_name.startswith(REGEOCODING_PREFIX)):
             station['latitude'] = None
             station['longitude'] = None  
-            station['place_name'] = f"NEEDS_REGEOCODING: {extracted_location}"
+            station['place_name'] = f"{REGEOCODING_PREFIX} {station.get('extracted_location', '')}"
             station['mapbox_place_type'] = None
             station['confidence'] = None
             station['method'] = 'pending_regeocoding'
-            fixed_count += 1
+            fixed_names.append(station.get('name', 'Unknown'))
     
-    if fixed_count > 0:
-        print(f"Fixed {fixed_count} inconsistent states")
+    if fixed_names:
+        print(f"Fixed {len(fixed_names)} inconsistent states")
+        if verbose:
+            print("\n".join(f"  Fixed inconsistent state: {name}" for name in fixed_names))
     else:
         print("No inconsistent states found")
     
-    return stations
+    return stations, bool(fixed_names)
 
 def get_statistics(stations: List[Dict]) -> None:
     """Print statistics about the stations"""
     total = len(stations)
-    needs_regeocoding = sum(1 for s in stations if s.get('needs_regeocoding', False))
-    successful = sum(1 for s in stations if s.get('latitude') is not None and s.get('longitude') is not None)
+    needs_regeocoding = 0
+    successful = 0
+    for s in stations:
+        if s.get('needs_regeocoding', False):
+            needs_regeocoding += 1
+        if s.get('latitude') is not None and s.get('longitude') is not None:
+            successful += 1
     
     print(f"\n=== STATISTICS ===")
     print(f"Total stations: {total}")
@@ -108,38 +237,64 @@ def get_statistics(stations: List[Dict]) -> None:
     print(f"Need re-geocoding: {needs_regeocoding}")
     print(f"Success rate: {successful/total*100:.1f}%")
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python cleanup_duplicates.py <geocoded_stations.json>")
-        print("\nThis will:")
-        print("- Remove duplicate stations (keeping most recent)")
-        print("- Fix inconsistent states (clear old coordinates for stations marked for re-geocoding)")
-        print("- Create a backup before making changes")
+def reexec_with_pypy(argv: List[str]) -> None:
+    """Replace this process with the same command under pypy3, if it is installed"""
+    if platform.python_implementation() == 'PyPy':
+        return
+    pypy = shutil.which('pypy3')
+    if not pypy:
+        print("WARNING: pypy3 not found, continuing with CPython")
         return
+    print(f"Re-running under {pypy}...")
+    sys.stdout.flush()
+    os.execv(pypy, [pypy, os.path.abspath(__file__)] + argv)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Remove duplicate stations (keeping most recent) and fix inconsistent states '
+                    '(clear old coordinates for stations marked for re-geocoding). '
+                    'A backup is created before making changes (the newest five are kept).')
+    parser.add_argument('json_file', help='Path to geocoded_stations.json file')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be cleaned without saving')
+    parser.add_argument('--verbose', action='store_true', help='List every duplicate and fixed station')
+    parser.add_argument('--pypy', action='store_true', help='Re-run under pypy3 when it is installed')
     
-    filename = sys.argv[1]
+    args = parser.parse_args()
+    
+    if args.pypy:
+        reexec_with_pypy([arg for arg in sys.argv[1:] if arg != '--pypy'])
+    
+    filename = args.json_file
+    verbose = args.verbose
     
     print(f"Loading stations from {filename}...")
-    stations = load_stations(filename)
+    
+    # Remove duplicates while streaming the file in
+    try:
+        stations, removed = remove_duplicates(load_stations(filename), verbose)
+    except Exception as e:
+        print(f"ERROR: Failed to load {filename}: {e}")
+        stations, removed = [], False
     
     if not stations:
         print("No stations loaded. Exiting.")
         return
     
-    print(f"Loaded {len(stations)} stations")
-    
-    # Get initial statistics
-    get_statistics(stations)
-    
-    # Remove duplicates
-    stations = remove_duplicates(stations)
-    
     # Fix inconsistent states
-    stations = fix_inconsistent_states(stations)
+    stations, fixed = fix_inconsistent_states(stations, verbose)
     
     # Get final statistics
     get_statistics(stations)
     
+    # Leave the file (and its backup/cache) alone if nothing changed
+    if not (removed or fixed):
+        print("\nNothing to clean.")
+        return
+    
+    if args.dry_run:
+        print("\nDry run: changes were not saved.")
+        return
+    
     # Save cleaned file
     if save_stations(filename, stations):
         print(f"\nCleaned file saved: {filename}")
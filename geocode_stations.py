@@ -8,6 +8,7 @@ and geocodes them using MapBox API with advanced location pattern matching.
 
 Requirements:
 pip install requests tqdm python-dotenv
+(optional: pip install orjson ijson for faster saving and streamed fetching)
 
 Usage:
 1. Create .env file with: MAPBOX_TOKEN=your_mapbox_token_here
@@ -23,20 +24,96 @@ Features:
 
 import os
 import re
+import sys
 import json
 import time
+import heapq
+import hashlib
+import functools
 import logging
+import sqlite3
+import threading
+import unicodedata
 import requests
-from typing import Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from uuid import UUID
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional: streams Radio Browser batches instead of loading them whole
+except ImportError:
+    ijson = None
+
 # Load environment variables
 load_dotenv()
 
-@dataclass
+# Word-level patterns used on every word of every station name
+_LETTER_RE = re.compile(r'^[a-zA-Zа-яА-Я\u00C0-\u017F\u0100-\u024F]+$')
+_RU_VOWELS_RE = re.compile(r'[аеиоуыэюя].*[аеиоуыэюя]')
+_EN_VOWELS_RE = re.compile(r'[aeiou].*[aeiou]')
+
+def _normalize_query(text: str) -> str:
+    """Normalize a location for cache lookups ("St. Petersburg" == "st petersburg")"""
+    folded = unicodedata.normalize('NFKC', text).casefold()
+    # Punctuation, symbols and separators become spaces; combining marks are kept,
+    # since in scripts like Devanagari and Thai they are part of the word
+    spaced = ''.join(' ' if c == '_' or unicodedata.category(c)[0] in 'PSZ' else c for c in folded)
+    return _WHITESPACE_RE.sub(' ', spaced).strip() or folded.strip()
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Encode to UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _json_loads(data: bytes):
+    """Decode UTF-8 JSON, with orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Result fields with few distinct values across all stations
+_INTERNED_FIELDS = ('country', 'state', 'location_type', 'mapbox_place_type', 'method', 'confidence')
+
+def _uuid_key(uuid: str) -> Union[bytes, str]:
+    """Canonical 16-byte form of a UUID, so case and format variants compare equal"""
+    try:
+        return UUID(uuid).bytes
+    except (TypeError, ValueError):
+        return uuid  # Malformed ids are still deduplicated, by their exact text
+
+def _intern_fields(result: Dict) -> Dict:
+    """Share one string object per distinct value of the repetitive result fields"""
+    for field in _INTERNED_FIELDS:
+        value = result.get(field)
+        if type(value) is str:
+            result[field] = sys.intern(value)
+    return result
+
+def _iter_json_array(response: requests.Response):
+    """Yield the items of a JSON array response, streaming them with ijson when it is installed"""
+    if ijson is None:
+        yield from response.json()
+        return
+    response.raw.decode_content = True  # Let urllib3 undo gzip before ijson sees the bytes
+    yield from ijson.items(response.raw, 'item')
+
+# Slotted instances (no per-instance __dict__) where the dataclass module supports it
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class GeoResult:
     """Geocoding result container"""
     latitude: float
@@ -46,7 +123,7 @@ class GeoResult:
     confidence: str
     method: str
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Station:
     """Radio station data container"""
     uuid: str
@@ -54,97 +131,139 @@ class Station:
     country: str
     state: str = ""
     
+# Location keywords in multiple languages
+_CITY_KEYWORDS = (
+    'city', 'град', 'город', 'ciudad', 'ville', 'stadt', 'città', 'cidade',
+    'メポ', '市', '都市', 'शहर', 'مدينة', 'πόλη', 'miasto', 'város'
+)
+
+_VILLAGE_KEYWORDS = (
+    'village', 'село', 'деревня', 'поселение', 'поселок', 'aldea', 'pueblo', 
+    'villaggio', 'dorf', '村', 'गांव', 'قرية', 'χωριό', 'wieś', 'falu'
+)
+
+_REGION_KEYWORDS = (
+    'region', 'область', 'район', 'округ', 'edge', 'county', 'province', 
+    'estado', 'região', '地域', 'क्षेत्र', 'منطقة', 'περιοχή', 'region', 'megye'
+)
+
+_RADIO_KEYWORDS = (
+    'radio', 'fm', 'am', 'радио', 'station', 'станция', 'rádio', 'راديو',
+    'ραδιόφωνο', 'ラジオ', 'रेडियो', 'radiostacja', 'rádió', 'emisora'
+)
+
+# Words that are clearly NOT geographic locations
+_NON_GEO = frozenset([
+    # Russian
+    'пирамида', 'радио', 'плюс', 'европа', 'русское', 'авто', 'хит', 'шансон', 
+    'ретро', 'классик', 'музыка', 'новости', 'спорт', 'энергия', 'максимум',
+    'люкс', 'элит', 'лайт', 'голд', 'джаз', 'блюз', 'рок', 'поп', 'дача',
+    'юмор', 'смех', 'юность', 'дорожное', 'такси', 'бизнес', 'эхо', 'голос',
+    'волна', 'звезда', 'комета', 'планета', 'орбита', 'космос', 'мир',
+    # English
+    'pyramid', 'plus', 'europe', 'auto', 'hit', 'retro', 'classic', 'music',
+    'news', 'sport', 'energy', 'maximum', 'luxury', 'elite', 'light', 'gold',
+    'jazz', 'blues', 'rock', 'pop', 'humor', 'laugh', 'youth', 'business',
+    'echo', 'voice', 'wave', 'star', 'comet', 'planet', 'orbit', 'space',
+    'world', 'super', 'mega', 'ultra', 'power', 'force', 'magic', 'diamond',
+    'crystal', 'rainbow', 'sunshine', 'moonlight', 'fire', 'ice', 'storm',
+    # Common brand words
+    'first', 'best', 'top', 'new', 'old', 'big', 'small', 'hot', 'cool',
+    'fresh', 'live', 'online', 'digital', 'network', 'central', 'main'
+])
+
+# Country name aliases
+_COUNTRY_ALIASES = {
+    'usa': 'united states', 'uk': 'united kingdom', 'uae': 'united arab emirates',
+    'russia': 'russian federation', 'россия': 'russian federation',
+    'украина': 'ukraine', 'беларусь': 'belarus', 'казахстан': 'kazakhstan',
+    'deutschland': 'germany', 'españa': 'spain', 'brasil': 'brazil'
+}
+
+# Common radio station prefixes/suffixes to ignore
+_IGNORE_PATTERNS = (
+    r'\b\d+[\.,]?\d*\s*(fm|am|mhz|khz)\b',  # Frequencies
+    r'\b(radio|fm|am|station|станция|радио)\b',  # Radio keywords
+    r'\b(the|la|le|el|der|die|das)\b',  # Articles
+    r'\b(music|rock|pop|jazz|news|sport)\b',  # Genres
+    r'\b(live|online|stream|digital)\b',  # Tech terms
+    r'[^\w\s\-\(\)\[\]]+',  # Special characters except basic ones
+)
+
+# Word lists used when scoring potential place names
+_PLACE_SUFFIXES = ('ово', 'ино', 'ск', 'град', 'бург', 'town', 'burg', 'ville')
+_COMMON_WORDS = frozenset({'the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'с', 'и', 'на', 'в', 'по'})
+_ADJECTIVES = frozenset({'new', 'old', 'big', 'hot', 'top', 'первый', 'новый', 'старый'})
+
+# Potential places tried per station; the best-scoring ones nearly always decide
+_MAX_POTENTIAL_PLACES = 5
+
+# Compile patterns once at import instead of per station
+_RADIO_RE = re.compile('|'.join(map(re.escape, _RADIO_KEYWORDS)))  # Substring match
+_IGNORE_RE = re.compile('|'.join(f'(?:{p})' for p in _IGNORE_PATTERNS), re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+_BRACKET_RES = (
+    re.compile(r'\(([^)]+)\)'),  # (location)
+    re.compile(r'\[([^\]]+)\]'),  # [location]
+    re.compile(r'\{([^}]+)\}'),   # {location}
+)
+# Per-keyword patterns, in keyword order: (location type, compiled patterns).
+# Each pattern is scanned on its own, so its matches keep their order and
+# repeats (one fused alternation would consume text the others need)
+_KEYWORD_RES = [
+    ('city', tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        rf'(\w+)\s+{keyword}',  # "Moscow city"
+        rf'{keyword}\s+(\w+)',  # "city Moscow"
+        rf'(\w+[-_]\w+)\s+{keyword}',  # "New-York city"
+    )))
+    for keyword in map(re.escape, _CITY_KEYWORDS)
+] + [
+    ('village', tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        rf'(\w+)\s+{keyword}',
+        rf'{keyword}\s+(\w+)',
+    )))
+    for keyword in map(re.escape, _VILLAGE_KEYWORDS)
+]
+# Finds every keyword in one scan: group N matches keyword N, and the
+# lookahead lets matches overlap (e.g. '市' inside '都市')
+_KEYWORD_RE = re.compile(
+    '(?=(?:' + '|'.join(f'({re.escape(kw)})' for kw in _CITY_KEYWORDS + _VILLAGE_KEYWORDS) + '))',
+    re.IGNORECASE
+)
+
 class LocationExtractor:
     """Advanced location extraction with multilingual support"""
     
-    def __init__(self):
-        # Location keywords in multiple languages
-        self.city_keywords = [
-            'city', 'град', 'город', 'ciudad', 'ville', 'stadt', 'città', 'cidade',
-            'メポ', '市', '都市', 'शहर', 'مدينة', 'πόλη', 'miasto', 'város'
-        ]
-        
-        self.village_keywords = [
-            'village', 'село', 'деревня', 'поселение', 'поселок', 'aldea', 'pueblo', 
-            'villaggio', 'dorf', '村', 'गांव', 'قرية', 'χωριό', 'wieś', 'falu'
-        ]
-        
-        self.region_keywords = [
-            'region', 'область', 'район', 'округ', 'edge', 'county', 'province', 
-            'estado', 'região', '地域', 'क्षेत्र', 'منطقة', 'περιοχή', 'region', 'megye'
-        ]
-        
-        self.radio_keywords = [
-            'radio', 'fm', 'am', 'радио', 'station', 'станция', 'rádio', 'راديو',
-            'ραδιόφωνο', 'ラジオ', 'रेडियो', 'radiostacja', 'rádió', 'emisora'
-        ]
-        
-        # Words that are clearly NOT geographic locations
-        self.non_geographic_words = [
-            # Russian
-            'пирамида', 'радио', 'плюс', 'европа', 'русское', 'авто', 'хит', 'шансон', 
-            'ретро', 'классик', 'музыка', 'новости', 'спорт', 'энергия', 'максимум',
-            'люкс', 'элит', 'лайт', 'голд', 'джаз', 'блюз', 'рок', 'поп', 'дача',
-            'юмор', 'смех', 'юность', 'дорожное', 'такси', 'бизнес', 'эхо', 'голос',
-            'волна', 'звезда', 'комета', 'планета', 'орбита', 'космос', 'мир',
-            # English
-            'pyramid', 'plus', 'europe', 'auto', 'hit', 'retro', 'classic', 'music',
-            'news', 'sport', 'energy', 'maximum', 'luxury', 'elite', 'light', 'gold',
-            'jazz', 'blues', 'rock', 'pop', 'humor', 'laugh', 'youth', 'business',
-            'echo', 'voice', 'wave', 'star', 'comet', 'planet', 'orbit', 'space',
-            'world', 'super', 'mega', 'ultra', 'power', 'force', 'magic', 'diamond',
-            'crystal', 'rainbow', 'sunshine', 'moonlight', 'fire', 'ice', 'storm',
-            # Common brand words
-            'first', 'best', 'top', 'new', 'old', 'big', 'small', 'hot', 'cool',
-            'fresh', 'live', 'online', 'digital', 'network', 'central', 'main'
-        ]
-        
-        # Country name aliases
-        self.country_aliases = {
-            'usa': 'united states', 'uk': 'united kingdom', 'uae': 'united arab emirates',
-            'russia': 'russian federation', 'россия': 'russian federation',
-            'украина': 'ukraine', 'беларусь': 'belarus', 'казахстан': 'kazakhstan',
-            'deutschland': 'germany', 'españa': 'spain', 'brasil': 'brazil'
-        }
-        
-        # Common radio station prefixes/suffixes to ignore
-        self.ignore_patterns = [
-            r'\b\d+[\.,]?\d*\s*(fm|am|mhz|khz)\b',  # Frequencies
-            r'\b(radio|fm|am|station|станция|радио)\b',  # Radio keywords
-            r'\b(the|la|le|el|der|die|das)\b',  # Articles
-            r'\b(music|rock|pop|jazz|news|sport)\b',  # Genres
-            r'\b(live|online|stream|digital)\b',  # Tech terms
-            r'[^\w\s\-\(\)\[\]]+',  # Special characters except basic ones
-        ]
+    # Shared with every instance; the tables above are built once per process
+    city_keywords = _CITY_KEYWORDS
+    village_keywords = _VILLAGE_KEYWORDS
+    region_keywords = _REGION_KEYWORDS
+    radio_keywords = _RADIO_KEYWORDS
+    non_geographic_words = _NON_GEO
+    country_aliases = _COUNTRY_ALIASES
+    ignore_patterns = _IGNORE_PATTERNS
     
-    def clean_name(self, name: str) -> str:
-        """Clean station name for location extraction"""
-        cleaned = name.lower().strip()
+    def clean_name(self, name: str, name_lower: Optional[str] = None) -> str:
+        """Clean station name for location extraction (name_lower: name.lower(), if already known)"""
+        cleaned = (name.lower() if name_lower is None else name_lower).strip()
         
-        # Remove ignore patterns
-        for pattern in self.ignore_patterns:
-            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+        # Remove ignore patterns (all of them in a single pass)
+        cleaned = _IGNORE_RE.sub(' ', cleaned)
         
         # Normalize whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
         return cleaned
     
     def extract_from_brackets(self, name: str) -> List[str]:
         """Extract locations from parentheses and brackets"""
         locations = []
+        radio_search = _RADIO_RE.search
         
         # Match parentheses and brackets
-        bracket_patterns = [
-            r'\(([^)]+)\)',  # (location)
-            r'\[([^\]]+)\]',  # [location]
-            r'\{([^}]+)\}',   # {location}
-        ]
-        
-        for pattern in bracket_patterns:
-            matches = re.findall(pattern, name, re.IGNORECASE)
-            for match in matches:
+        for pattern in _BRACKET_RES:
+            for match in pattern.findall(name):
                 location = match.strip()
-                if len(location) > 2 and not any(kw in location.lower() for kw in self.radio_keywords):
+                if len(location) > 2 and not radio_search(location.lower()):
                     locations.append(location)
         
         return locations
@@ -152,168 +271,267 @@ class LocationExtractor:
     def extract_with_keywords(self, name: str) -> List[Tuple[str, str]]:
         """Extract locations using keyword patterns"""
         locations = []
+        non_geo = _NON_GEO
+        radio_search = _RADIO_RE.search
         
-        # Check city keywords
-        for keyword in self.city_keywords:
-            patterns = [
-                rf'(\w+)\s+{re.escape(keyword)}',  # "Moscow city"
-                rf'{re.escape(keyword)}\s+(\w+)',  # "city Moscow"
-                rf'(\w+[-_]\w+)\s+{re.escape(keyword)}',  # "New-York city"
-            ]
-            
+        # Only run the patterns of keywords that actually occur in the name
+        found = sorted({match.lastindex for match in _KEYWORD_RE.finditer(name)})
+        for index in found:
+            loc_type, patterns = _KEYWORD_RES[index - 1]
             for pattern in patterns:
-                matches = re.findall(pattern, name, re.IGNORECASE)
-                for match in matches:
+                for match in pattern.findall(name):
+                    if len(match) <= 2:
+                        continue
                     # Filter out blacklisted words
-                    if (len(match) > 2 and 
-                        match.lower() not in self.non_geographic_words and
-                        not any(kw in match.lower() for kw in self.radio_keywords)):
-                        locations.append((match, 'city'))
-        
-        # Check village keywords
-        for keyword in self.village_keywords:
-            patterns = [
-                rf'(\w+)\s+{re.escape(keyword)}',
-                rf'{re.escape(keyword)}\s+(\w+)',
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, name, re.IGNORECASE)
-                for match in matches:
-                    # Filter out blacklisted words  
-                    if (len(match) > 2 and
-                        match.lower() not in self.non_geographic_words and
-                        not any(kw in match.lower() for kw in self.radio_keywords)):
-                        locations.append((match, 'village'))
+                    match_lower = match.lower()
+                    if match_lower not in non_geo and not radio_search(match_lower):
+                        locations.append((match, loc_type))
         
         return locations
     
-    def extract_potential_places(self, name: str) -> List[str]:
+    def extract_potential_places(self, name: str, name_lower: Optional[str] = None) -> List[str]:
         """Extract potential place names from cleaned text with intelligent filtering"""
-        cleaned = self.clean_name(name)
+        cleaned = self.clean_name(name, name_lower)
         words = cleaned.split()
         
         potential_places = []
+        # Bind the lookups used for every word as locals
+        non_geo = _NON_GEO
+        common_words = _COMMON_WORDS
+        radio_search = _RADIO_RE.search
+        letter_match = _LETTER_RE.match
+        score_word = self._score_place_likelihood
         for word in words:
             # Skip if too short, numeric, or radio-related
             if (len(word) <= 2 or 
                 word.isdigit() or 
-                any(kw in word for kw in self.radio_keywords) or
-                not re.match(r'^[a-zA-Zа-яА-Я\u00C0-\u017F\u0100-\u024F]+$', word)):
+                radio_search(word) or
+                not letter_match(word)):
                 continue
             
             # Skip words that are clearly not geographic
-            if word.lower() in self.non_geographic_words:
+            word_lower = word.lower()
+            if word_lower in non_geo:
+                continue
+            # Common words (all 3 letters here) can never score above 0, so skip scoring them
+            if word_lower in common_words:
                 continue
                 
             # Score the word based on how likely it is to be a place name
-            score = self._score_place_likelihood(word)
+            score = score_word(word, word_lower)
             if score > 0:  # Only include words with positive scores
                 potential_places.append((word, score))
         
-        # Sort by score (highest first) and return just the words
-        potential_places.sort(key=lambda x: x[1], reverse=True)
-        return [word for word, score in potential_places]
+        # Keep the best scores (highest first, ties in name order) and return just the words
+        best = heapq.nlargest(_MAX_POTENTIAL_PLACES, potential_places, key=lambda x: x[1])
+        return [word for word, score in best]
     
-    def _score_place_likelihood(self, word: str) -> int:
+    def _score_place_likelihood(self, word: str, word_lower: Optional[str] = None) -> int:
         """Score how likely a word is to be a place name (higher = more likely)"""
         score = 10  # Base score
-        word_lower = word.lower()
+        if word_lower is None:
+            word_lower = word.lower()
         
         # Positive indicators
         if len(word) >= 6:  # Longer words often place names
             score += 3
         if word[0].isupper():  # Capitalized (proper nouns)
             score += 2
-        if re.search(r'[аеиоуыэюя].*[аеиоуыэюя]', word_lower):  # Russian vowel pattern
+        if _RU_VOWELS_RE.search(word_lower):  # Russian vowel pattern
             score += 2
-        if re.search(r'[aeiou].*[aeiou]', word_lower):  # English vowel pattern
+        if _EN_VOWELS_RE.search(word_lower):  # English vowel pattern
             score += 2
-        if word_lower.endswith(('ово', 'ино', 'ск', 'град', 'бург', 'town', 'burg', 'ville')):  # Place suffixes
+        if word_lower.endswith(_PLACE_SUFFIXES):  # Place suffixes
             score += 5
         
         # Negative indicators
-        if word_lower in ['the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'с', 'и', 'на', 'в', 'по']:  # Common words
+        if word_lower in _COMMON_WORDS:  # Common words
             score -= 10
         if len(word) == 3:  # 3-letter words less likely to be places
             score -= 2
-        if word_lower in ['new', 'old', 'big', 'hot', 'top', 'первый', 'новый', 'старый']:  # Adjectives
+        if word_lower in _ADJECTIVES:  # Adjectives
             score -= 5
             
         return score
     
-    def extract_locations(self, station: Station) -> List[Tuple[str, str, int]]:
+    def extract_locations(self, station: Station) -> Iterator[Tuple[str, str, int]]:
         """
-        Extract all potential locations from station data
-        Returns: List of (location, type, priority) tuples
+        Extract all potential locations from station data, lazily
+        Yields: (location, type, priority) tuples, highest priority first
         """
-        locations = []
+        # Sources are tried from highest to lowest priority, so the first
+        # occurrence of a location always carries its best priority
+        seen = set()
+        name = station.name
+        name_lower = name.lower()
         
-        # 1. Extract from brackets (highest priority)
-        bracket_locations = self.extract_from_brackets(station.name)
-        for loc in bracket_locations:
-            locations.append((loc, 'extracted', 10))
-        
-        # 2. Extract with keywords (high priority)
-        keyword_locations = self.extract_with_keywords(station.name)
-        for loc, loc_type in keyword_locations:
-            locations.append((loc, loc_type, 8))
-        
-        # 3. State/province (medium priority)
-        if station.state and len(station.state) > 2:
-            locations.append((station.state, 'region', 6))
-        
-        # 4. Potential places from name (low priority)
-        potential_places = self.extract_potential_places(station.name)
-        for place in potential_places:
-            locations.append((place, 'potential', 4))
-        
-        # 5. Country fallback (lowest priority)
-        if station.country:
-            country = self.country_aliases.get(station.country.lower(), station.country)
-            locations.append((country, 'country', 2))
-        
-        # Remove duplicates and sort by priority
-        unique_locations = {}
-        for loc, loc_type, priority in locations:
-            key = loc.lower()
-            if key not in unique_locations or unique_locations[key][2] < priority:
-                unique_locations[key] = (loc, loc_type, priority)
+        def candidates():
+            # 1. Extract from brackets (highest priority)
+            for loc in self.extract_from_brackets(name):
+                yield loc, 'extracted', 10
+            
+            # 2. Extract with keywords (high priority)
+            for loc, loc_type in self.extract_with_keywords(name):
+                yield loc, loc_type, 8
+            
+            # 3. State/province (medium priority)
+            if station.state and len(station.state) > 2:
+                yield station.state, 'region', 6
+            
+            # 4. Potential places from name (low priority)
+            for place in self.extract_potential_places(name, name_lower):
+                yield place, 'potential', 4
+            
+            # 5. Country fallback (lowest priority)
+            if station.country:
+                country = _COUNTRY_ALIASES.get(station.country.lower(), station.country)
+                yield country, 'country', 2
         
-        return sorted(unique_locations.values(), key=lambda x: x[2], reverse=True)
+        # Remove duplicates as they are produced
+        for loc, loc_type, priority in candidates():
+            key = loc.lower()
+            if key not in seen:
+                seen.add(key)
+                yield loc, loc_type, priority
+
+class GeocodeCache:
+    """Persistent geocoding cache backed by SQLite, shared by all worker threads"""
+    
+    def __init__(self, filename: str = 'geocode_cache.sqlite'):
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS geocode_cache ('
+                'key TEXT PRIMARY KEY, result TEXT NOT NULL, timestamp REAL NOT NULL)'
+            )
+    
+    def get(self, key: str) -> Optional[GeoResult]:
+        """Return the cached result for a key, or None"""
+        with self._lock:
+            row = self._conn.execute('SELECT result FROM geocode_cache WHERE key = ?', (key,)).fetchone()
+        return GeoResult(**json.loads(row[0])) if row else None
+    
+    def __getitem__(self, key: str) -> GeoResult:
+        result = self.get(key)
+        if result is None:
+            raise KeyError(key)
+        return result
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def __setitem__(self, key: str, result: GeoResult):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO geocode_cache (key, result, timestamp) VALUES (?, ?, ?)',
+                (key, json.dumps(asdict(result), ensure_ascii=False), time.time())
+            )
+
+# Canonical country name (as normalized by MapBoxGeocoder) -> spellings
+# accepted in the country part of a MapBox place name
+_COUNTRY_VARIATIONS = {
+    'russia': ('russia', 'russian federation', 'russian', 'россия'),
+    'united states': ('united states', 'usa', 'america', 'us'),
+    'united kingdom': ('united kingdom', 'uk', 'great britain', 'britain', 'england'),
+    'germany': ('germany', 'deutschland', 'german'),
+    'france': ('france', 'french'),
+    'spain': ('spain', 'spanish', 'españa'),
+    'italy': ('italy', 'italian', 'italia'),
+    'brazil': ('brazil', 'brazilian', 'brasil'),
+    'mexico': ('mexico', 'mexican', 'méxico'),
+    'canada': ('canada', 'canadian'),
+    'australia': ('australia', 'australian'),
+    'china': ('china', 'chinese', '中国'),
+    'japan': ('japan', 'japanese', '日本'),
+    'india': ('india', 'indian'),
+    'netherlands': ('netherlands', 'dutch', 'holland'),
+    'sweden': ('sweden', 'swedish', 'sverige'),
+    'norway': ('norway', 'norwegian', 'norge'),
+    'denmark': ('denmark', 'danish', 'danmark'),
+    'finland': ('finland', 'finnish', 'suomi'),
+    'poland': ('poland', 'polish', 'polska'),
+    'romania': ('romania', 'romanian', 'românia'),
+    'greece': ('greece', 'greek', 'ελλάδα'),
+    'turkey': ('turkey', 'turkish', 'türkiye'),
+    'south africa': ('south africa', 'south african'),
+    'argentina': ('argentina', 'argentinian'),
+    'chile': ('chile', 'chilean'),
+    'colombia': ('colombia', 'colombian'),
+    'venezuela': ('venezuela', 'venezuelan'),
+    'peru': ('peru', 'peruvian', 'perú')
+}
+_COUNTRY_VARIATION_SETS = {
+    country: frozenset(variations) for country, variations in _COUNTRY_VARIATIONS.items()
+}
+
+_COUNTRY_MAPPING = {
+    'the russian federation': 'russia',
+    'russian federation': 'russia',
+    'united states': 'united states',
+    'usa': 'united states',
+    'united kingdom': 'united kingdom',
+    'uk': 'united kingdom',
+    'great britain': 'united kingdom'
+}
 
 class MapBoxGeocoder:
     """MapBox API geocoding service"""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, cache_file: str = 'geocode_cache.sqlite', pool_size: int = 32):
         self.token = token
         self.base_url = "https://api.mapbox.com/geocoding/v5/mapbox.places"
-        self.cache = {}
+        self.cache = GeocodeCache(cache_file)
         self.api_calls = 0
-        self.last_reset = time.time()
         self.max_calls_per_minute = 300  # Conservative limit
         
+        # Reuse connections across calls and worker threads (one pooled connection per worker)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=pool_size))
+        
+        # Start times of the calls made in the last minute, shared by all threads
+        self._call_times = deque()
+        self._rate_lock = threading.Lock()
+        
+        # Bounded in-memory layer over the SQLite cache; it also remembers
+        # queries MapBox had no match for, so they are not re-sent this run
+        self._lookup = functools.lru_cache(maxsize=100_000)(self._lookup_uncached)
+        
     def _rate_limit_check(self):
-        """Check and enforce rate limits"""
-        now = time.time()
-        if now - self.last_reset > 60:  # Reset every minute
-            self.api_calls = 0
-            self.last_reset = now
-        
-        if self.api_calls >= self.max_calls_per_minute:
-            sleep_time = 60 - (now - self.last_reset)
-            if sleep_time > 0:
-                logging.info(f"Rate limit reached, sleeping for {sleep_time:.1f} seconds")
-                time.sleep(sleep_time)
-                self.api_calls = 0
-                self.last_reset = time.time()
+        """Check and enforce rate limits (sliding one-minute window, thread-safe)"""
+        with self._rate_lock:
+            now = time.monotonic()
+            while self._call_times and now - self._call_times[0] >= 60:
+                self._call_times.popleft()
+            
+            if len(self._call_times) >= self.max_calls_per_minute:
+                # Other threads wait on the lock while this one sleeps
+                sleep_time = 60 - (now - self._call_times[0])
+                if sleep_time > 0:
+                    logging.info(f"Rate limit reached, sleeping for {sleep_time:.1f} seconds")
+                    time.sleep(sleep_time)
+                self._call_times.popleft()
+            
+            self._call_times.append(time.monotonic())
+            self.api_calls += 1
     
     def geocode(self, location: str, country: str = None, place_type: str = 'place') -> Optional[GeoResult]:
         """Geocode a location using MapBox API"""
+        try:
+            return self._lookup(location, country, place_type)
+        except Exception as e:
+            # Raised errors are not memoized, so the query is retried next time
+            logging.warning(f"Geocoding failed for '{location}': {e}")
+            return None
+    
+    def _lookup_uncached(self, location: str, country: Optional[str], place_type: str) -> Optional[GeoResult]:
+        """Look a location up in the persistent cache, then MapBox (raises on request errors)"""
         # Check cache first
-        cache_key = f"{location.lower()}_{country}_{place_type}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cache_key = self._cache_key(location, country, place_type)
+        cached = self.cache.get(cache_key)
+        if cached:
+            return cached
         
         # Rate limiting
         self._rate_limit_check()
@@ -332,146 +550,113 @@ class MapBoxGeocoder:
             'potential': 'place,locality,region'
         }.get(place_type, 'place,locality,region,country')
         
-        try:
-            url = f"{self.base_url}/{requests.utils.quote(query)}.json"
-            params = {
-                'access_token': self.token,
-                'types': types,
-                'limit': 5  # Get more results for better validation
-            }
-            
-            self.api_calls += 1
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+        url = f"{self.base_url}/{requests.utils.quote(query)}.json"
+        params = {
+            'access_token': self.token,
+            'types': types,
+            'limit': 5  # Get more results for better validation
+        }
+        
+        response = self.session.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if data.get('features'):
+            # Try to find the best matching result
+            best_result = None
+            # Normalize country names for comparison (once for all features)
+            normalized_country = self._normalize_country_name(country) if country else None
             
-            if data.get('features'):
-                # Try to find the best matching result
-                best_result = None
+            for feature in data['features']:
+                lng, lat = feature['center']
+                place_name = feature['place_name']
+                feature_types = feature.get('place_type', [])
                 
-                for feature in data['features']:
-                    lng, lat = feature['center']
-                    place_name = feature['place_name']
-                    feature_types = feature.get('place_type', [])
+                # Country validation - check if result is in expected country
+                country_match = True
+                if country:
+                    # MapBox format: "City, State, Country" - check the actual country part
+                    actual_country = place_name.rpartition(',')[2].strip().lower()
                     
-                    # Country validation - check if result is in expected country
-                    country_match = True
-                    if country:
-                        # Normalize country names for comparison
-                        normalized_country = self._normalize_country_name(country)
-                        place_name_lower = place_name.lower()
-                        
-                        # MapBox format: "City, State, Country" - check the actual country part
-                        place_parts = [part.strip() for part in place_name.split(',')]
-                        actual_country = place_parts[-1].lower() if place_parts else ""
-                        
-                        # Get country variations for more flexible matching
-                        country_variations = self._get_country_variations(normalized_country)
-                        
-                        # Check if the actual country matches any variation
-                        country_match = any(var in actual_country for var in country_variations)
-                        
-                        if not country_match:
-                            logging.debug(f"Country mismatch: expected '{country}' (variations: {country_variations}), got actual country: '{actual_country}' from '{place_name}'")
-                            continue
+                    # Check if the actual country matches any variation
+                    country_match = self._country_matches(actual_country, normalized_country)
                     
-                    # Determine confidence based on feature type and country match
-                    if 'place' in feature_types or 'locality' in feature_types:
-                        confidence = 'high' if country_match else 'medium'
-                    elif 'region' in feature_types:
-                        confidence = 'medium' if country_match else 'low'
-                    else:
-                        confidence = 'low'
-                    
-                    result = GeoResult(
-                        latitude=lat,
-                        longitude=lng,
-                        place_name=place_name,
-                        place_type=feature_types[0] if feature_types else 'unknown',
-                        confidence=confidence,
-                        method='mapbox'
-                    )
-                    
-                    # Prefer results with country match and higher confidence
-                    if not best_result or (country_match and confidence == 'high'):
-                        best_result = result
-                        if country_match and confidence == 'high':
-                            break  # Found ideal result
+                    if not country_match:
+                        logging.debug(f"Country mismatch: expected '{country}' (variations: {self._get_country_variations(normalized_country)}), got actual country: '{actual_country}' from '{place_name}'")
+                        continue
                 
-                if best_result:
-                    # Cache result
-                    self.cache[cache_key] = best_result
-                    return best_result
+                # Determine confidence based on feature type and country match
+                if 'place' in feature_types or 'locality' in feature_types:
+                    confidence = 'high' if country_match else 'medium'
+                elif 'region' in feature_types:
+                    confidence = 'medium' if country_match else 'low'
+                else:
+                    confidence = 'low'
                 
-        except Exception as e:
-            logging.warning(f"Geocoding failed for '{location}': {e}")
+                result = GeoResult(
+                    latitude=lat,
+                    longitude=lng,
+                    place_name=place_name,
+                    place_type=feature_types[0] if feature_types else 'unknown',
+                    confidence=confidence,
+                    method='mapbox'
+                )
+                
+                # Prefer results with country match and higher confidence
+                if not best_result or (country_match and confidence == 'high'):
+                    best_result = result
+                    if country_match and confidence == 'high':
+                        break  # Found ideal result
+            
+            if best_result:
+                # Cache result
+                self.cache[cache_key] = best_result
+                return best_result
         
         return None
     
+    def _cache_key(self, location: str, country: Optional[str], place_type: str) -> str:
+        """Build a short cache key; equivalent spellings of a query share an entry"""
+        normalized_country = self._normalize_country_name(country) if country else ''
+        raw_key = f"{_normalize_query(location)}|{normalized_country}|{place_type}"
+        return hashlib.blake2b(raw_key.encode('utf-8'), digest_size=16).hexdigest()
+    
     def _normalize_country_name(self, country: str) -> str:
         """Normalize country name for comparison"""
-        country_mapping = {
-            'the russian federation': 'russia',
-            'russian federation': 'russia',
-            'united states': 'united states',
-            'usa': 'united states',
-            'united kingdom': 'united kingdom',
-            'uk': 'united kingdom',
-            'great britain': 'united kingdom'
-        }
-        
         normalized = country.lower().strip()
-        return country_mapping.get(normalized, normalized)
+        return _COUNTRY_MAPPING.get(normalized, normalized)
     
     def _get_country_variations(self, country: str) -> List[str]:
         """Get common variations of country names"""
-        variations = {
-            'russia': ['russia', 'russian federation', 'russian', 'россия'],
-            'united states': ['united states', 'usa', 'america', 'us'],
-            'united kingdom': ['united kingdom', 'uk', 'great britain', 'britain', 'england'],
-            'germany': ['germany', 'deutschland', 'german'],
-            'france': ['france', 'french'],
-            'spain': ['spain', 'spanish', 'españa'],
-            'italy': ['italy', 'italian', 'italia'],
-            'brazil': ['brazil', 'brazilian', 'brasil'],
-            'mexico': ['mexico', 'mexican', 'méxico'],
-            'canada': ['canada', 'canadian'],
-            'australia': ['australia', 'australian'],
-            'china': ['china', 'chinese', '中国'],
-            'japan': ['japan', 'japanese', '日本'],
-            'india': ['india', 'indian'],
-            'netherlands': ['netherlands', 'dutch', 'holland'],
-            'sweden': ['sweden', 'swedish', 'sverige'],
-            'norway': ['norway', 'norwegian', 'norge'],
-            'denmark': ['denmark', 'danish', 'danmark'],
-            'finland': ['finland', 'finnish', 'suomi'],
-            'poland': ['poland', 'polish', 'polska'],
-            'romania': ['romania', 'romanian', 'românia'],
-            'greece': ['greece', 'greek', 'ελλάδα'],
-            'turkey': ['turkey', 'turkish', 'türkiye'],
-            'south africa': ['south africa', 'south african'],
-            'argentina': ['argentina', 'argentinian'],
-            'chile': ['chile', 'chilean'],
-            'colombia': ['colombia', 'colombian'],
-            'venezuela': ['venezuela', 'venezuelan'],
-            'peru': ['peru', 'peruvian', 'perú']
-        }
-        
-        return variations.get(country.lower(), [country.lower()])
+        country = country.lower()
+        return list(_COUNTRY_VARIATIONS.get(country, (country,)))
+    
+    def _country_matches(self, actual_country: str, normalized_country: str) -> bool:
+        """Check whether the country part of a place name is a variation of the expected country"""
+        variations = _COUNTRY_VARIATION_SETS.get(normalized_country)
+        if variations is None:
+            return normalized_country in actual_country
+        # Exact spellings are the common case; fall back to the substring scan
+        return actual_country in variations or any(var in actual_country for var in variations)
 
 class StationGeocoder:
     """Main geocoding orchestrator"""
     
-    def __init__(self, mapbox_token: str):
+    def __init__(self, mapbox_token: str, output_file: str = 'geocoded_stations.json', max_workers: int = 10):
         """Initialize the geocoder with MapBox token"""
-        self.mapbox_geocoder = MapBoxGeocoder(mapbox_token)
+        self.mapbox_geocoder = MapBoxGeocoder(mapbox_token, pool_size=max_workers)
         self.location_extractor = LocationExtractor()
         self.processed_uuids = set()
         self.results = []
+        self._seen_uuids = set()  # _uuid_key() of every UUID in self.results
         self.progress_file = 'geocoding_progress.json'
-        self.output_file = 'geocoded_stations.json'
+        self.output_file = output_file
+        # Results are appended here as they arrive; output_file is rewritten only at the end
+        self.journal_file = f"{output_file}.ndjson"
+        self._journal_fp = None
         self.reprocess_file = None  # File to reprocess marked stations from
+        self.max_workers = max_workers  # Concurrent MapBox requests
         
         # Load existing progress
         self._load_progress()
@@ -499,29 +684,99 @@ class StationGeocoder:
         
         if Path(self.output_file).exists():
             try:
-                with open(self.output_file, 'r', encoding='utf-8') as f:
-                    self.results = json.load(f)
+                with open(self.output_file, 'rb') as f:
+                    self.results = [_intern_fields(result) for result in _json_loads(f.read())]
                     logging.info(f"Loaded {len(self.results)} existing results")
             except Exception as e:
                 logging.warning(f"Could not load results: {e}")
+        
+        # Results from a run that stopped before writing the output file
+        if Path(self.journal_file).exists():
+            try:
+                self._replay_journal()
+            except Exception as e:
+                logging.warning(f"Could not replay {self.journal_file}: {e}")
+        
+        # Deduplicate once here; run() then keeps results unique as it appends
+        self._deduplicate_results()
+    
+    def _replay_journal(self):
+        """Merge results recorded in the journal into the loaded results"""
+        lookup = {_uuid_key(result.get('uuid')): i for i, result in enumerate(self.results)}
+        recovered = 0
+        
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    result = _json_loads(line)
+                except ValueError:
+                    break  # Partially written last line
+                
+                # A reprocessed station replaces its earlier result
+                key = _uuid_key(result.get('uuid'))
+                index = lookup.get(key)
+                if index is None:
+                    lookup[key] = len(self.results)
+                    self.results.append(result)
+                else:
+                    self.results[index] = result
+                recovered += 1
+        
+        logging.info(f"Recovered {recovered} results from {self.journal_file}")
+    
+    def _append_journal(self, result: Dict):
+        """Append one result to the journal so it survives a crash"""
+        try:
+            if self._journal_fp is None:
+                self._journal_fp = open(self.journal_file, 'ab')
+            self._journal_fp.write(_json_dumps(result) + b'\n')
+            self._journal_fp.flush()
+        except Exception as e:
+            logging.error(f"Could not write to {self.journal_file}: {e}")
     
     def _save_progress(self):
-        """Save current progress"""
+        """Save current progress (processed UUIDs; results are journaled as they arrive)"""
         try:
-            # Save processed UUIDs
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump({
+            with open(self.progress_file, 'wb') as f:
+                f.write(_json_dumps({
                     'processed_uuids': list(self.processed_uuids),
                     'timestamp': time.time()
-                }, f, indent=2)
-            
-            # Save results
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, indent=2, ensure_ascii=False)
-                
+                }, indent=True))
         except Exception as e:
             logging.error(f"Could not save progress: {e}")
     
+    def _save_results(self):
+        """Write all results to the output file and clear the journal"""
+        try:
+            # Swap the new file in atomically so a crash can't lose both it and the journal;
+            # it is synced to disk first so this also holds after a power loss
+            tmp_file = f"{self.output_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(_json_dumps(self.results, indent=True))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.output_file)
+            
+            # This runs on every periodic snapshot, so make the rename itself durable
+            # too (POSIX only; directories can't be synced on Windows)
+            if hasattr(os, 'O_DIRECTORY'):
+                dir_fd = os.open(os.path.dirname(os.path.abspath(self.output_file)), os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            
+            # The journal is only dropped once its results are safely in the output file
+            if self._journal_fp is not None:
+                self._journal_fp.close()
+                self._journal_fp = None
+            if Path(self.journal_file).exists():
+                os.remove(self.journal_file)
+        except Exception as e:
+            logging.error(f"Could not save results: {e}")
+    
     def _safe_log_text(self, text: str) -> str:
         """Convert text to ASCII-safe format for logging"""
         return text.encode('ascii', 'replace').decode('ascii')
@@ -561,37 +816,46 @@ class StationGeocoder:
             offset = 0
             limit = 10000  # Fetch in chunks
             
-            while True:
-                url = f"{base_url}?offset={offset}&limit={limit}&has_geo_info=false"
-                
-                print(f"Fetching stations {offset} to {offset + limit}...")
-                response = requests.get(url, timeout=30)
+            # One keep-alive connection for every batch, retrying transient failures
+            retries = Retry(
+                total=5,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False  # Hand the last response to the status check below
+            )
+            with requests.Session() as session:
+                session.mount('http://', HTTPAdapter(max_retries=retries))
                 
-                if response.status_code != 200:
-                    print(f"ERROR: API request failed with status {response.status_code}")
-                    break
-                
-                stations_batch = response.json()
-                
-                if not stations_batch:
-                    break  # No more stations
-                
-                # Filter stations without coordinates
-                for station_data in stations_batch:
-                    if not station_data.get('geo_lat') and not station_data.get('geo_long'):
-                        station = Station(
-                            uuid=station_data.get('stationuuid', ''),
-                            name=station_data.get('name', ''),
-                            country=station_data.get('country', ''),
-                            state=station_data.get('state', '')
-                        )
-                        all_stations.append(station)
-                
-                offset += limit
-                
-                # Break if we got fewer results than requested (end of data)
-                if len(stations_batch) < limit:
-                    break
+                while True:
+                    url = f"{base_url}?offset={offset}&limit={limit}&has_geo_info=false"
+                    
+                    print(f"Fetching stations {offset} to {offset + limit}...")
+                    with session.get(url, stream=True, timeout=30) as response:
+                        if response.status_code != 200:
+                            print(f"ERROR: API request failed with status {response.status_code}")
+                            break
+                        
+                        # Filter stations without coordinates as they arrive
+                        batch_size = 0
+                        for station_data in _iter_json_array(response):
+                            batch_size += 1
+                            if not station_data.get('geo_lat') and not station_data.get('geo_long'):
+                                station = Station(
+                                    uuid=station_data.get('stationuuid', ''),
+                                    name=station_data.get('name', ''),
+                                    country=station_data.get('country', ''),
+                                    state=station_data.get('state', '')
+                                )
+                                all_stations.append(station)
+                    
+                    if not batch_size:
+                        break  # No more stations
+                    
+                    offset += limit
+                    
+                    # Break if we got fewer results than requested (end of data)
+                    if batch_size < limit:
+                        break
             
             print(f"Found {len(all_stations)} stations without coordinates")
             return all_stations
@@ -602,18 +866,17 @@ class StationGeocoder:
     
     def geocode_station(self, station: Station) -> Optional[Dict]:
         """Geocode a single station"""
-        locations = self.location_extractor.extract_locations(station)
-        
-        if not locations:
-            logging.warning(f"No locations extracted for station: {self._safe_log_text(station.name)}")
-            return None
+        # Locations are extracted lazily, so lower-priority ones are only
+        # computed when the better candidates fail to geocode
+        extracted_any = False
         
         # Try each location in priority order
-        for location, loc_type, priority in locations:
+        for location, loc_type, priority in self.location_extractor.extract_locations(station):
+            extracted_any = True
             result = self.mapbox_geocoder.geocode(location, station.country, loc_type)
             
             if result:
-                geocoded_station = {
+                geocoded_station = _intern_fields({
                     'uuid': station.uuid,
                     'name': station.name,
                     'country': station.country,
@@ -629,11 +892,15 @@ class StationGeocoder:
                     'method': result.method,
                     'timestamp': time.time()
                     # Note: 'needs_regeocoding' flag is intentionally omitted - this clears the flag
-                }
+                })
                 
                 logging.info(f"SUCCESS: Geocoded: {self._safe_log_text(station.name)} -> {self._safe_log_text(result.place_name)}")
                 return geocoded_station
         
+        if not extracted_any:
+            logging.warning(f"No locations extracted for station: {self._safe_log_text(station.name)}")
+            return None
+        
         logging.warning(f"FAILED: Failed to geocode: {self._safe_log_text(station.name)}")
         return None
     
@@ -647,62 +914,84 @@ class StationGeocoder:
             logging.error("No stations to process")
             return
         
+        # Skip stations an earlier run already geocoded before any extraction or
+        # lookups (stations marked for re-geocoding are revisited on purpose).
+        # processed_uuids also holds failures, which may have been transient
+        # MapBox errors, so only stations with a result are skipped
+        if not self.reprocess_file and self._seen_uuids:
+            remaining = [station for station in stations if _uuid_key(station.uuid) not in self._seen_uuids]
+            if len(remaining) < len(stations):
+                logging.info(f"Skipping {len(stations) - len(remaining)} stations geocoded by a previous run")
+            stations = remaining
+        
         logging.info(f"Processing {len(stations)} stations...")
         
         # If we're reprocessing, create a lookup for existing results
         existing_results_lookup = {}
         if self.reprocess_file:
             for i, result in enumerate(self.results):
-                existing_results_lookup[result['uuid']] = i
+                existing_results_lookup[_uuid_key(result['uuid'])] = i
             print(f"Created lookup for {len(existing_results_lookup)} existing results")
         
         success_count = 0
         error_count = 0
         
-        # Process with progress bar
-        with tqdm(total=len(stations), desc="Geocoding stations") as pbar:
-            for i, station in enumerate(stations):
-                try:
-                    result = self.geocode_station(station)
-                    
-                    if result:
-                        # If reprocessing, update existing entry instead of adding new one
-                        if self.reprocess_file and station.uuid in existing_results_lookup:
-                            existing_index = existing_results_lookup[station.uuid]
-                            self.results[existing_index] = result
-                            print(f"  Updated existing result for: {station.name}")
+        # Geocode concurrently (the MapBox rate limiter paces the workers),
+        # and collect results on this thread as they complete
+        with tqdm(total=len(stations), desc="Geocoding stations") as pbar, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.geocode_station, station): station for station in stations}
+            completed = 0
+            try:
+                for future in as_completed(futures):
+                    station = futures[future]
+                    try:
+                        result = future.result()
+                        
+                        if result:
+                            key = _uuid_key(station.uuid)
+                            # If reprocessing, update existing entry instead of adding new one
+                            if self.reprocess_file and key in existing_results_lookup:
+                                existing_index = existing_results_lookup[key]
+                                self.results[existing_index] = result
+                                self._append_journal(result)
+                                print(f"  Updated existing result for: {station.name}")
+                            elif station.uuid and key not in self._seen_uuids:
+                                self._seen_uuids.add(key)
+                                self.results.append(result)
+                                self._append_journal(result)
+                            success_count += 1
                         else:
-                            self.results.append(result)
-                        success_count += 1
-                    else:
+                            error_count += 1
+                        
+                        # Mark as processed
+                        self.processed_uuids.add(station.uuid)
+                        pbar.update(1)
+                        
+                        # Save progress every 100 stations
+                        completed += 1
+                        if completed % 100 == 0:
+                            self._save_progress()
+                            # Snapshot the full results every 500 so the journal stays short
+                            if completed % 500 == 0:
+                                self._save_results()
+                            pbar.set_postfix({
+                                'Success': success_count,
+                                'Errors': error_count,
+                                'API Calls': self.mapbox_geocoder.api_calls
+                            })
+                        
+                    except Exception as e:
+                        logging.error(f"Error processing station {self._safe_log_text(station.name)}: {e}")
                         error_count += 1
-                    
-                    # Mark as processed
-                    self.processed_uuids.add(station.uuid)
-                    pbar.update(1)
-                    
-                    # Save progress every 100 stations
-                    if (i + 1) % 100 == 0:
-                        self._save_progress()
-                        pbar.set_postfix({
-                            'Success': success_count,
-                            'Errors': error_count,
-                            'API Calls': self.mapbox_geocoder.api_calls
-                        })
-                    
-                    # Small delay to be nice to APIs
-                    time.sleep(0.1)
-                    
-                except KeyboardInterrupt:
-                    logging.info("Process interrupted by user")
-                    break
-                except Exception as e:
-                    logging.error(f"Error processing station {self._safe_log_text(station.name)}: {e}")
-                    error_count += 1
-        
-        # Final save with deduplication
-        self._deduplicate_results()
+            except KeyboardInterrupt:
+                logging.info("Process interrupted by user")
+                # Drop queued stations; only the few in flight are waited for
+                executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Final save (results were kept unique while collecting them)
         self._save_progress()
+        self._save_results()
         
         logging.info(f"""
         SUCCESS: Geocoding completed!
@@ -715,18 +1004,19 @@ class StationGeocoder:
         """)
     
     def _deduplicate_results(self):
-        """Remove duplicate results based on UUID"""
+        """Remove duplicate results based on UUID and record the UUIDs that remain"""
+        seen_uuids = self._seen_uuids = set()
         if not self.results:
             return
         
-        seen_uuids = set()
         deduplicated = []
         duplicates_removed = 0
         
         for result in self.results:
             uuid = result.get('uuid')
-            if uuid and uuid not in seen_uuids:
-                seen_uuids.add(uuid)
+            key = _uuid_key(uuid) if uuid else None
+            if key is not None and key not in seen_uuids:
+                seen_uuids.add(key)
                 deduplicated.append(result)
             else:
                 duplicates_removed += 1
@@ -744,9 +1034,13 @@ def main():
     parser.add_argument('--limit', type=int, help='Limit number of stations to process (for testing)')
     parser.add_argument('--reprocess', type=str, help='Reprocess stations marked for re-geocoding from this file')
     parser.add_argument('--output', type=str, default='geocoded_stations.json', help='Output file name')
+    parser.add_argument('--workers', type=int, default=10, help='Number of concurrent MapBox requests')
     
     args = parser.parse_args()
     
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    
     # Load MapBox token from environment or use provided
     mapbox_token = args.mapbox_token or os.getenv('MAPBOX_TOKEN')
     
@@ -758,8 +1052,7 @@ def main():
     print("Starting geocoding process...")
     
     # Initialize geocoder
-    geocoder = StationGeocoder(mapbox_token)
-    geocoder.output_file = args.output
+    geocoder = StationGeocoder(mapbox_token, output_file=args.output, max_workers=args.workers)
     
     # Set reprocess file if specified
     if args.reprocess:
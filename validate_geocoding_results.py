@@ -6,18 +6,89 @@ Validate and fix geocoding results to catch and repair obvious errors
 import json
 import sys
 import os
+import glob
 import time
+import shutil
 import argparse
-from typing import Dict, List, Set, Optional, Tuple
+import functools
+import heapq
+import itertools
+from typing import Dict, Iterable, Iterator, List, Set, Optional, Tuple
 import re
 
+try:
+    import orjson  # Optional: much faster JSON loading/saving
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional: streams stations for read-only checks
+except ImportError:
+    ijson = None
+
+# Word-level patterns used on every word of every station name
+_LETTER_RE = re.compile(r'^[a-zA-Zа-яА-Я\u00C0-\u017F\u0100-\u024F]+$')
+_RU_VOWELS_RE = re.compile(r'[аеиоуыэюя].*[аеиоуыэюя]')
+_EN_VOWELS_RE = re.compile(r'[aeiou].*[aeiou]')
+
+# Station fields with few distinct values across the whole file
+_INTERNED_FIELDS = ('country', 'state', 'location_type', 'mapbox_place_type', 'method', 'confidence')
+
+# Number of timestamped backups kept next to a saved results file
+MAX_BACKUPS = 5
+
+# Word lists used when scoring potential place names
+_COMMON_WORDS = frozenset({'the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'с', 'и', 'на', 'в', 'по'})
+_ADJECTIVES = frozenset({'new', 'old', 'big', 'hot', 'top', 'первый', 'новый', 'старый'})
+
+# Potential places kept per station; --fix only ever uses the best location
+_MAX_POTENTIAL_PLACES = 8
+
+# Obviously bad extracted locations
+_BAD_EXTRACTIONS = frozenset([
+    'пирамида', 'pyramid', 'плюс', 'plus', 'европа', 'europe', 
+    'радио', 'radio', 'хит', 'hit', 'музыка', 'music', 'спорт', 'sport',
+    'энергия', 'energy', 'максимум', 'maximum', 'классик', 'classic',
+    'джаз', 'jazz', 'блюз', 'blues', 'рок', 'rock', 'поп', 'pop'
+])
+
+# South American countries a Russian station should never be geocoded to
+_WRONG_COUNTRY_RE = re.compile('venezuela|colombia|brazil|mexico|argentina|peru')
+
+@functools.lru_cache(maxsize=16384)
+def _score_word(word: str, word_lower: str) -> int:
+    """Score how likely a word is to be a place name (higher = more likely)"""
+    score = 10  # Base score
+    
+    # Positive indicators
+    if len(word) >= 6:  # Longer words often place names
+        score += 3
+    if word[0].isupper():  # Capitalized (proper nouns)
+        score += 2
+    if _RU_VOWELS_RE.search(word_lower):  # Russian vowel pattern
+        score += 2
+    if _EN_VOWELS_RE.search(word_lower):  # English vowel pattern
+        score += 2
+    if word_lower.endswith(('ово', 'ино', 'ск', 'град', 'бург', 'town', 'burg', 'ville')):  # Place suffixes
+        score += 5
+    
+    # Negative indicators
+    if word_lower in _COMMON_WORDS:
+        score -= 10
+    if len(word) == 3:  # 3-letter words less likely to be places
+        score -= 2
+    if word_lower in _ADJECTIVES:
+        score -= 5
+        
+    return score
+
 # Import the improved geocoding logic
 class LocationExtractor:
     """Improved location extractor with smart filtering"""
     
     def __init__(self):
         # Words that are clearly NOT geographic locations
-        self.non_geographic_words = [
+        self.non_geographic_words = frozenset([
             # Russian
             'пирамида', 'радио', 'плюс', 'европа', 'русское', 'авто', 'хит', 'шансон', 
             'ретро', 'классик', 'музыка', 'новости', 'спорт', 'энергия', 'максимум',
@@ -34,7 +105,7 @@ class LocationExtractor:
             # Common brand words
             'first', 'best', 'top', 'new', 'old', 'big', 'small', 'hot', 'cool',
             'fresh', 'live', 'online', 'digital', 'network', 'central', 'main'
-        ]
+        ])
         
         self.radio_keywords = [
             'radio', 'fm', 'am', 'радио', 'station', 'станция', 'rádio', 'راديو',
@@ -49,45 +120,50 @@ class LocationExtractor:
             r'\b(live|online|stream|digital)\b',
             r'[^\w\s\-\(\)\[\]]+',
         ]
+        
+        self.city_keywords = ['city', 'город', 'ciudad', 'ville', 'stadt', 'città', 'cidade']
+        
+        # Compile patterns once instead of on every station
+        self._ignore_re = re.compile('|'.join(f'(?:{p})' for p in self.ignore_patterns), re.IGNORECASE)
+        self._whitespace_re = re.compile(r'\s+')
+        self._radio_re = re.compile('|'.join(map(re.escape, self.radio_keywords)))  # Substring match
+        # Per-keyword patterns, in keyword order. Each pattern is scanned on its
+        # own, so its matches keep their order and repeats (one fused
+        # alternation would consume text the others need)
+        self._city_keyword_res = [
+            tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+                rf'(\w+)\s+{keyword}',  # "Moscow city"
+                rf'{keyword}\s+(\w+)',  # "city Moscow"
+                rf'(\w+[-_]\w+)\s+{keyword}',  # "New-York city"
+            ))
+            for keyword in map(re.escape, self.city_keywords)
+        ]
+        # Finds every keyword in one scan: group N matches keyword N, and the
+        # lookahead lets matches overlap
+        self._city_keyword_re = re.compile(
+            '(?=(?:' + '|'.join(f'({re.escape(kw)})' for kw in self.city_keywords) + '))',
+            re.IGNORECASE
+        )
+        
+        # extract_locations results by (name, state); chains share names
+        self._cache: Dict[Tuple[str, str], List[Tuple[str, str, int]]] = {}
     
     def clean_name(self, name: str) -> str:
         """Clean station name for location extraction"""
         cleaned = name.lower().strip()
         
-        # Remove ignore patterns
-        for pattern in self.ignore_patterns:
-            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+        # Remove ignore patterns (all of them in a single pass)
+        cleaned = self._ignore_re.sub(' ', cleaned)
         
         # Normalize whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = self._whitespace_re.sub(' ', cleaned).strip()
         return cleaned
     
-    def _score_place_likelihood(self, word: str) -> int:
-        """Score how likely a word is to be a place name (higher = more likely)"""
-        score = 10  # Base score
-        word_lower = word.lower()
-        
-        # Positive indicators
-        if len(word) >= 6:  # Longer words often place names
-            score += 3
-        if word[0].isupper():  # Capitalized (proper nouns)
-            score += 2
-        if re.search(r'[аеиоуыэюя].*[аеиоуыэюя]', word_lower):  # Russian vowel pattern
-            score += 2
-        if re.search(r'[aeiou].*[aeiou]', word_lower):  # English vowel pattern
-            score += 2
-        if word_lower.endswith(('ово', 'ино', 'ск', 'град', 'бург', 'town', 'burg', 'ville')):  # Place suffixes
-            score += 5
-        
-        # Negative indicators
-        if word_lower in ['the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'с', 'и', 'на', 'в', 'по']:
-            score -= 10
-        if len(word) == 3:  # 3-letter words less likely to be places
-            score -= 2
-        if word_lower in ['new', 'old', 'big', 'hot', 'top', 'первый', 'новый', 'старый']:
-            score -= 5
-            
-        return score
+    def _score_place_likelihood(self, word: str, word_lower: Optional[str] = None) -> int:
+        """Score how likely a word is to be a place name (cached per word, shared by all extractors)"""
+        if word_lower is None:
+            word_lower = word.lower()
+        return _score_word(word, word_lower)
     
     def extract_potential_places(self, name: str) -> List[str]:
         """Extract potential place names from cleaned text with intelligent filtering"""
@@ -99,43 +175,39 @@ class LocationExtractor:
             # Skip if too short, numeric, or radio-related
             if (len(word) <= 2 or 
                 word.isdigit() or 
-                any(kw in word for kw in self.radio_keywords) or
-                not re.match(r'^[a-zA-Zа-яА-Я\u00C0-\u017F\u0100-\u024F]+$', word)):
+                self._radio_re.search(word) or
+                not _LETTER_RE.match(word)):
                 continue
             
             # Skip words that are clearly not geographic
-            if word.lower() in self.non_geographic_words:
+            word_lower = word.lower()
+            if word_lower in self.non_geographic_words:
                 continue
                 
             # Score the word based on how likely it is to be a place name
-            score = self._score_place_likelihood(word)
+            score = self._score_place_likelihood(word, word_lower)
             if score > 0:  # Only include words with positive scores
                 potential_places.append((word, score))
         
-        # Sort by score (highest first) and return just the words
-        potential_places.sort(key=lambda x: x[1], reverse=True)
-        return [word for word, score in potential_places]
+        # Keep the best scores (highest first, ties in name order) and return just the words
+        best = heapq.nlargest(_MAX_POTENTIAL_PLACES, potential_places, key=lambda x: x[1])
+        return [word for word, score in best]
 
     def extract_with_keywords(self, name: str) -> List[Tuple[str, str]]:
         """Extract locations using keyword patterns with blacklist filtering"""
         locations = []
         
-        # Check city keywords  
-        city_keywords = ['city', 'город', 'ciudad', 'ville', 'stadt', 'città', 'cidade']
-        for keyword in city_keywords:
-            patterns = [
-                rf'(\w+)\s+{re.escape(keyword)}',  # "Moscow city"
-                rf'{re.escape(keyword)}\s+(\w+)',  # "city Moscow"
-                rf'(\w+[-_]\w+)\s+{re.escape(keyword)}',  # "New-York city"
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, name, re.IGNORECASE)
-                for match in matches:
+        # Check city keywords (only those that actually occur in the name)
+        found = sorted({match.lastindex for match in self._city_keyword_re.finditer(name)})
+        for index in found:
+            for pattern in self._city_keyword_res[index - 1]:
+                for match in pattern.findall(name):
+                    if len(match) <= 2:
+                        continue
                     # Filter out blacklisted words
-                    if (len(match) > 2 and 
-                        match.lower() not in self.non_geographic_words and
-                        not any(kw in match.lower() for kw in self.radio_keywords)):
+                    match_lower = match.lower()
+                    if (match_lower not in self.non_geographic_words and
+                        not self._radio_re.search(match_lower)):
                         locations.append((match, 'city'))
         
         return locations
@@ -145,28 +217,28 @@ class LocationExtractor:
         Extract all potential locations from station data  
         Returns: List of (location, type, priority) tuples
         """
+        # Country does not affect the result, so it is not part of the key
+        key = (name, state)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._cache[key] = self._extract_locations(name, state)
+        return list(cached)
+    
+    def _extract_locations(self, name: str, state: str) -> List[Tuple[str, str, int]]:
+        """Extract locations without consulting the cache"""
         locations = []
         
-        # Create a fake station object for compatibility
-        class FakeStation:
-            def __init__(self, name, country, state):
-                self.name = name
-                self.country = country  
-                self.state = state
-        
-        station = FakeStation(name, country, state)
-        
         # 1. Extract with keywords (high priority) 
-        keyword_locations = self.extract_with_keywords(station.name)
+        keyword_locations = self.extract_with_keywords(name)
         for loc, loc_type in keyword_locations:
             locations.append((loc, loc_type, 8))
         
         # 2. State/province (medium priority)
-        if station.state and len(station.state) > 2:
-            locations.append((station.state, 'region', 6))
+        if state and len(state) > 2:
+            locations.append((state, 'region', 6))
         
         # 3. Potential places from name (low priority)
-        potential_places = self.extract_potential_places(station.name)
+        potential_places = self.extract_potential_places(name)
         for place in potential_places:
             locations.append((place, 'potential', 4))
         
@@ -179,27 +251,79 @@ class LocationExtractor:
         
         return sorted(unique_locations.values(), key=lambda x: x[2], reverse=True)
 
+def intern_fields(station: Dict) -> Dict:
+    """Share one string object per distinct value of the repetitive station fields"""
+    for field in _INTERNED_FIELDS:
+        value = station.get(field)
+        if type(value) is str:
+            station[field] = sys.intern(value)
+    return station
+
 def load_geocoded_results(filename: str) -> List[Dict]:
     """Load geocoded stations from JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if orjson is not None:
+            with open(filename, 'rb') as f:
+                stations = orjson.loads(f.read())
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                stations = json.load(f)
+        return [intern_fields(station) for station in stations]
     except Exception as e:
         print(f"ERROR: Failed to load {filename}: {e}")
         return []
 
+def stream_stations(filename: str) -> Iterator[Dict]:
+    """Yield geocoded stations one at a time (falls back to loading the whole file)"""
+    if ijson is None:
+        yield from load_geocoded_results(filename)
+        return
+    # Parse errors propagate, so a truncated file is never mistaken for a complete one
+    with open(filename, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+def remove_old_backups(filename: str, keep: int = MAX_BACKUPS) -> None:
+    """Delete all but the newest `keep` timestamped backups of a file"""
+    # Only files named <file>.backup.<unix time> are considered; cleanup_duplicates.py
+    # writes its backups under the same name and rotates them the same way
+    backups = sorted(
+        (int(path.rsplit('.', 1)[-1]), path)
+        for path in glob.glob(f"{glob.escape(filename)}.backup.*")
+        if path.rsplit('.', 1)[-1].isdigit()
+    )
+    for _, old_backup in backups[:-keep] if keep > 0 else backups:
+        try:
+            os.remove(old_backup)
+        except OSError as e:
+            print(f"WARNING: Could not remove old backup {old_backup}: {e}")
+
 def save_geocoded_results(filename: str, stations: List[Dict]) -> bool:
     """Save geocoded stations to JSON file"""
     try:
-        # Create backup first
-        backup_name = f"{filename}.backup.{int(time.time())}"
+        # Write to a temporary file first so a crash never leaves a partial file
+        tmp_name = f"{filename}.tmp"
+        if orjson is not None:
+            with open(tmp_name, 'wb') as f:
+                f.write(orjson.dumps(stations, option=orjson.OPT_INDENT_2))
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(stations, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+        
+        # Create backup (a hardlink to the old file, copied only if linking fails)
         if os.path.exists(filename):
-            import shutil
-            shutil.copy2(filename, backup_name)
+            backup_name = f"{filename}.backup.{int(time.time())}"
+            try:
+                os.link(filename, backup_name)
+            except OSError:
+                shutil.copy2(filename, backup_name)
             print(f"Created backup: {backup_name}")
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(stations, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_name, filename)
+        remove_old_backups(filename)
         return True
     except Exception as e:
         print(f"ERROR: Failed to save {filename}: {e}")
@@ -216,21 +340,14 @@ def validate_station_result(station: Dict) -> List[str]:
     confidence = station.get('confidence', '')
     
     # Check for obvious mismatches
-    if 'russian federation' in country or 'russia' in country:
+    if 'russia' in country:  # Also covers 'russian federation'
         # Russian station shouldn't be in other countries
-        if any(wrong_country in place_name.lower() for wrong_country in 
-               ['venezuela', 'colombia', 'brazil', 'mexico', 'argentina', 'peru']):
+        place_name_lower = place_name.lower()
+        if _WRONG_COUNTRY_RE.search(place_name_lower):
             issues.append(f"Russian station geocoded to South America: {place_name}")
     
     # Check for obviously bad extracted locations
-    bad_extractions = [
-        'пирамида', 'pyramid', 'плюс', 'plus', 'европа', 'europe', 
-        'радио', 'radio', 'хит', 'hit', 'музыка', 'music', 'спорт', 'sport',
-        'энергия', 'energy', 'максимум', 'maximum', 'классик', 'classic',
-        'джаз', 'jazz', 'блюз', 'blues', 'рок', 'rock', 'поп', 'pop'
-    ]
-    
-    if extracted_location in bad_extractions:
+    if extracted_location in _BAD_EXTRACTIONS:
         issues.append(f"Bad extraction: '{extracted_location}' from '{name}'")
     
     # Check for confidence issues
@@ -286,23 +403,26 @@ def fix_problematic_station(station: Dict, extractor: LocationExtractor, mapbox_
         print(f"  ERROR fixing station {station['name']}: {e}")
         return None
 
-def find_problematic_results(stations: List[Dict], max_issues: int = 20) -> List[Dict]:
+def find_problematic_results(stations: Iterable[Dict], max_issues: int = 20) -> List[Dict]:
     """Find and report the most problematic geocoding results"""
-    print("=== GEOCODING VALIDATION REPORT ===")
-    print()
-    
-    total_stations = len(stations)
-    problematic_stations = []
+    total_stations = 0
+    problematic = []  # (station, issues)
     
+    # Only the problematic stations are kept, so this works on a stream too
+    # (nothing is printed until the whole stream has been read)
     for station in stations:
-        if is_problematic_station(station):
-            problematic_stations.append(station)
+        total_stations += 1
+        issues = validate_station_result(station)
+        if issues:
+            problematic.append((station, issues))
     
-    issue_count = len(problematic_stations)
+    issue_count = len(problematic)
+    
+    print("=== GEOCODING VALIDATION REPORT ===")
+    print()
     
     # Show first few issues
-    for i, station in enumerate(problematic_stations[:max_issues]):
-        issues = validate_station_result(station)
+    for station, issues in problematic[:max_issues]:
         print(f"PROBLEMATIC: {station.get('name', 'Unknown')}")
         print(f"  UUID: {station.get('uuid', 'Unknown')}")
         print(f"  Country: {station.get('country', 'Unknown')}")
@@ -321,7 +441,7 @@ def find_problematic_results(stations: List[Dict], max_issues: int = 20) -> List
     if issue_count > max_issues:
         print(f"(Showing first {max_issues} issues only)")
     
-    return problematic_stations
+    return [station for station, _ in problematic]
 
 def fix_geocoding_file(filename: str, mapbox_token: str = None) -> None:
     """Fix problematic geocoding results in the JSON file"""
@@ -334,12 +454,14 @@ def fix_geocoding_file(filename: str, mapbox_token: str = None) -> None:
     
     print(f"Loaded {len(stations)} stations")
     
-    # Find problematic stations
+    # Find problematic stations (by position, so they can be replaced in place),
+    # validating each station only once
     print("\nIdentifying problematic stations...")
-    problematic = []
-    for station in stations:
-        if is_problematic_station(station):
-            problematic.append(station)
+    problematic = []  # (index, issues)
+    for i, station in enumerate(stations):
+        issues = validate_station_result(station)
+        if issues:
+            problematic.append((i, issues))
     
     if not problematic:
         print("No problematic stations found!")
@@ -347,8 +469,8 @@ def fix_geocoding_file(filename: str, mapbox_token: str = None) -> None:
     
     print(f"Found {len(problematic)} problematic stations")
     print("\nExamples of problems:")
-    for station in problematic[:3]:
-        issues = validate_station_result(station)
+    for index, issues in problematic[:3]:
+        station = stations[index]
         print(f"  {station['name']} -> {station.get('place_name', 'Unknown')}")
         for issue in issues:
             print(f"    - {issue}")
@@ -365,16 +487,13 @@ def fix_geocoding_file(filename: str, mapbox_token: str = None) -> None:
     
     print(f"\nFixing {len(problematic)} stations...")
     
-    # Create a lookup for quick station updates
-    station_lookup = {station['uuid']: i for i, station in enumerate(stations)}
-    
-    for i, problem_station in enumerate(problematic):
+    for i, (station_index, _) in enumerate(problematic):
+        problem_station = stations[station_index]
         print(f"[{i+1}/{len(problematic)}] Fixing: {problem_station['name']}")
         
         fixed_station = fix_problematic_station(problem_station, extractor, mapbox_token)
         if fixed_station:
             # Update the station in the main list
-            station_index = station_lookup[problem_station['uuid']]
             stations[station_index] = fixed_station
             fixed_count += 1
         
@@ -392,35 +511,36 @@ def fix_geocoding_file(filename: str, mapbox_token: str = None) -> None:
     else:
         print("Failed to save updated file!")
 
-def check_specific_station(stations: List[Dict], search_name: str) -> None:
+def check_specific_station(stations: Iterable[Dict], search_name: str) -> None:
     """Check a specific station by name"""
     search_lower = search_name.lower()
-    found = False
     
-    for station in stations:
-        if search_lower in station.get('name', '').lower():
-            found = True
-            print(f"=== FOUND: {station.get('name')} ===")
-            print(f"UUID: {station.get('uuid')}")
-            print(f"Country: {station.get('country')}")
-            print(f"Extracted: {station.get('extracted_location')}")
-            print(f"Location Type: {station.get('location_type')}")
-            print(f"Priority: {station.get('priority')}")
-            print(f"Coordinates: {station.get('latitude')}, {station.get('longitude')}")
-            print(f"Place Name: {station.get('place_name')}")
-            print(f"Confidence: {station.get('confidence')}")
-            print(f"Method: {station.get('method')}")
-            
-            issues = validate_station_result(station)
-            if issues:
-                print("ISSUES:")
-                for issue in issues:
-                    print(f"  - {issue}")
-            else:
-                print("No obvious issues detected.")
-            print()
-    
-    if not found:
+    # Collect the matches first so nothing is printed from a partially read stream
+    matches = [station for station in stations
+               if search_lower in station.get('name', '').lower()]
+    
+    for station in matches:
+        print(f"=== FOUND: {station.get('name')} ===")
+        print(f"UUID: {station.get('uuid')}")
+        print(f"Country: {station.get('country')}")
+        print(f"Extracted: {station.get('extracted_location')}")
+        print(f"Location Type: {station.get('location_type')}")
+        print(f"Priority: {station.get('priority')}")
+        print(f"Coordinates: {station.get('latitude')}, {station.get('longitude')}")
+        print(f"Place Name: {station.get('place_name')}")
+        print(f"Confidence: {station.get('confidence')}")
+        print(f"Method: {station.get('method')}")
+        
+        issues = validate_station_result(station)
+        if issues:
+            print("ISSUES:")
+            for issue in issues:
+                print(f"  - {issue}")
+        else:
+            print("No obvious issues detected.")
+        print()
+    
+    if not matches:
         print(f"No stations found matching '{search_name}'")
 
 def main():
@@ -436,21 +556,30 @@ def main():
         print(f"ERROR: File not found: {args.json_file}")
         return
     
-    stations = load_geocoded_results(args.json_file)
-    
-    if not stations:
-        print("No stations loaded. Exiting.")
+    if args.fix and not args.search:
+        # Fix problematic results (loads and rewrites the whole file itself)
+        fix_geocoding_file(args.json_file, args.mapbox_token)
         return
     
-    if args.search:
-        # Search for specific station
-        check_specific_station(stations, args.search)
-    elif args.fix:
-        # Fix problematic results
-        fix_geocoding_file(args.json_file, args.mapbox_token)
-    else:
-        # Just validate and report
-        find_problematic_results(stations)
+    # The read-only checks look at each station once, so stream them
+    try:
+        stations = stream_stations(args.json_file)
+        first = next(stations, None)
+        
+        if first is None:
+            print("No stations loaded. Exiting.")
+            return
+        stations = itertools.chain([first], stations)
+        
+        if args.search:
+            # Search for specific station
+            check_specific_station(stations, args.search)
+        else:
+            # Just validate and report
+            find_problematic_results(stations)
+    except Exception as e:
+        print(f"ERROR: Failed to load {args.json_file}: {e}")
+        print("No stations loaded. Exiting.")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file